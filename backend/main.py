@@ -1,27 +1,48 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
+import heapq
 import logging
 import os
+import re
 import subprocess
+import sys
+import threading
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import suppress
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
-import json
+from functools import lru_cache
+from itertools import chain
 from pathlib import Path
-import re
 import time
-from typing import Any, Dict, Iterable, List, Optional, Tuple, Literal, Set
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple, Literal, Set
 from uuid import uuid4
-from difflib import SequenceMatcher
 
 from fastapi import FastAPI, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 import httpx
-from pydantic import BaseModel, Field, HttpUrl, ValidationError
-from urllib.parse import urljoin, urlparse, urlunparse, urlencode, parse_qs
-from bs4 import BeautifulSoup
+import orjson
+from pydantic import BaseModel, Field, HttpUrl
+from rapidfuzz import process
+from rapidfuzz.distance import Indel
+from urllib.parse import quote_plus, urljoin, urlparse
+from lxml import etree
+import lxml.html
+from starlette.exceptions import HTTPException as StarletteHTTPException
+
+from matching import (
+    canonicalize_title,
+    extract_chapter_details,
+    is_structural_match,
+    last_progress_index,
+    normalize_text,
+)
 
 try:
     import browser_cookie3
@@ -29,7 +50,11 @@ except ImportError:  # pragma: no cover - handled at runtime
     browser_cookie3 = None
 
 logging.basicConfig(level=logging.INFO)
-app = FastAPI(title="Manga Tracker API", version="0.1.0")
+app = FastAPI(
+    title="Manga Tracker API",
+    version="0.1.0",
+    default_response_class=ORJSONResponse,
+)
 
 logger = logging.getLogger("manga_tracker")
 
@@ -45,30 +70,73 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 FRONTEND_DIST = BASE_DIR / "frontend" / "dist"
 INDEX_HTML = FRONTEND_DIST / "index.html"
 
+# vite fingerprints every file under assets/, so a given URL never changes content; index.html
+# must always be revalidated so a new build is picked up
+ASSET_CACHE_CONTROL = "public, max-age=31536000, immutable"
+INDEX_CACHE_CONTROL = "no-cache"
+
+
+class AssetStaticFiles(StaticFiles):
+    def file_response(
+        self, full_path: Any, stat_result: os.stat_result, scope: Any, status_code: int = 200
+    ) -> Response:
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        response.headers["cache-control"] = ASSET_CACHE_CONTROL
+        return response
+
+
 assets_dir = FRONTEND_DIST / "assets"
 if assets_dir.exists():
-    app.mount("/assets", StaticFiles(directory=assets_dir), name="assets")
+    app.mount("/assets", AssetStaticFiles(directory=assets_dir), name="assets")
 
 DATA_DIR = Path(__file__).resolve().parent / "data"
 DATA_DIR.mkdir(parents=True, exist_ok=True)
 WEBSITES_FILE = DATA_DIR / "websites.json"
 SERIES_FILE = DATA_DIR / "series.json"
 
+# digest of the bytes last read from / written to each data file, used to skip no-op rewrites
+_record_digests: Dict[Path, bytes] = {}
+# the persist worker writes from a to_thread worker and mutations made without a running worker
+# write from the threadpool, so writes (and _record_digests) are serialized here
+_record_write_lock = threading.Lock()
+
+
+def _json_default(value: Any) -> str:
+    # orjson handles datetimes natively; pydantic URL types and friends fall back to str
+    return str(value)
+
 
 def load_json_records(path: Path) -> List[Dict]:
-    if not path.exists():
+    try:
+        data = path.read_bytes()
+    except FileNotFoundError:
         return []
     try:
-        with path.open("r", encoding="utf-8") as handle:
-            return json.load(handle)
-    except json.JSONDecodeError:
+        records = orjson.loads(data)
+    except orjson.JSONDecodeError:
         logger.warning("Failed to parse %s, defaulting to empty list", path)
         return []
+    _record_digests[path] = hashlib.blake2b(data).digest()
+    return records
 
 
 def write_json_records(path: Path, payload: List[Dict]) -> None:
-    with path.open("w", encoding="utf-8") as handle:
-        json.dump(payload, handle, indent=2)
+    data = orjson.dumps(payload, default=_json_default, option=orjson.OPT_INDENT_2)
+    digest = hashlib.blake2b(data).digest()
+    with _record_write_lock:
+        if _record_digests.get(path) == digest and path.exists():
+            return
+        # write to a uniquely named sibling and swap it in so a crash never leaves a truncated
+        # store behind and no other writer can share the temp file
+        tmp_path = path.with_name(f".{path.name}.{uuid4().hex}.tmp")
+        try:
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            with suppress(FileNotFoundError):
+                tmp_path.unlink()
+            raise
+        _record_digests[path] = digest
 
 
 def normalize_optional_str(value: Optional[str]) -> Optional[str]:
@@ -147,6 +215,22 @@ def collect_browser_cookies(host: str, include_names: Optional[Set[str]] = None)
     return results
 
 
+def wait_for_browser_cookies(
+    host: str, include_names: Optional[Set[str]], deadline: float
+) -> List[StoredCookie]:
+    # runs on cookie_executor: re-read the cookie jar with backoff until cookies appear, the
+    # deadline passes, or shutdown sets cookie_wait_cancelled
+    delay = COOKIE_POLL_INITIAL_DELAY
+    while True:
+        cookies = collect_browser_cookies(host, include_names)
+        if cookies:
+            return cookies
+        remaining = deadline - time.monotonic()
+        if remaining <= 0 or cookie_wait_cancelled.wait(min(delay, remaining)):
+            return []
+        delay = min(delay * 2, COOKIE_POLL_MAX_DELAY)
+
+
 def site_cookie_values(site: Website) -> Dict[str, str]:
     cookies: Dict[str, str] = {}
     for entry in getattr(site, "auth_cookies", []) or []:
@@ -201,11 +285,28 @@ def build_manual_cookies(host: str, entries: Dict[str, str]) -> List[StoredCooki
     return cookies
 
 SCAN_TIMEOUT = httpx.Timeout(10.0, connect=5.0)
+COOKIE_POLL_INITIAL_DELAY = 0.5
+COOKIE_POLL_MAX_DELAY = 2.0
+MAX_PAGE_FETCHES_PER_SITE = 4
+MAX_CONCURRENT_SITE_FETCHES = 16
 MAX_RESPONSE_BYTES = 1_000_000
 USER_AGENT = "MangaTrackerBot/0.1 (+https://github.com/)"
 POLL_INTERVAL_SECONDS = 60
-CHAPTER_REGEX = re.compile(r"(?:chapter|chap|ch\.?|c)\s*(\d+(?:\.\d+)?)", re.IGNORECASE)
+# idle connections must outlive the gap between polls or the shared client reconnects every run
+SCAN_LIMITS = httpx.Limits(
+    max_keepalive_connections=64,
+    max_connections=128,
+    keepalive_expiry=POLL_INTERVAL_SECONDS + 15,
+)
 MAX_CANDIDATE_ELEMENTS = 8000
+MIN_SNIPPET_LENGTH = 2
+MAX_SNIPPET_LENGTH = 200
+RECENT_CHAPTER_LIMIT = 5
+# site-wide chrome (menus, page header/footer) never carries series listings; script, style,
+# template and ruby annotation text is never visible title text
+STRIPPED_ELEMENTS_XPATH = (
+    "//nav | /html/body/header | /html/body/footer | //script | //style | //template | //rt | //rp"
+)
 CANDIDATE_TAGS = [
     "a",
     "h1",
@@ -224,12 +325,32 @@ CANDIDATE_TAGS = [
 ATTRIBUTE_TEXT_FIELDS = ("title", "aria-label", "data-title", "data-name", "data-label", "data-chapter")
 
 poller_task: asyncio.Task | None = None
+persist_task: asyncio.Task | None = None
+# the connection pool outlives each fetch run; clients (and their cookie jars) are per run
+http_transport: httpx.AsyncHTTPTransport | None = None
+# browser_cookie3 reads serialize on the browser's sqlite files, so a small dedicated pool is enough;
+# created per app lifetime in start_poller since shutdown tears it down
+cookie_executor: ThreadPoolExecutor | None = None
+cookie_wait_cancelled = threading.Event()
+# shared by every poll and manual refresh so large configs don't open all sites at once; created
+# per app lifetime in start_poller since a semaphore binds to the loop that first waits on it
+site_fetch_semaphore: asyncio.Semaphore | None = None
+PERSIST_COALESCE_SECONDS = 0.05
+
+
+# defined ahead of the models that embed it so their schemas build at import, not on first use
+class PaginationConfig(BaseModel):
+    strategy: Literal["query", "path"] = "query"
+    parameter: Optional[str] = None
+    template: Optional[str] = None
+    start: int = 1
+    pages: int = 1
 
 
 class WebsiteCreate(BaseModel):
     label: str
     url: HttpUrl
-    pagination: Optional["PaginationConfig"] = None
+    pagination: Optional[PaginationConfig] = None
     series_url_template: Optional[str] = None
     chapter_url_template: Optional[str] = None
 
@@ -263,6 +384,10 @@ class WebsitePublic(WebsiteCreate):
     last_reauth_at: Optional[datetime] = None
 
 
+# Website declares these in the same order, so list_sites can dump it without a WebsitePublic copy
+PUBLIC_SITE_FIELDS = set(WebsitePublic.model_fields)
+
+
 class ReauthRequest(BaseModel):
     wait_seconds: int = 45
     include_names: List[str] = Field(default_factory=lambda: ["cf_clearance", "__cf_bm"])
@@ -317,15 +442,53 @@ class Match(BaseModel):
     sources: List[SourceHit]
 
 
-CandidateEntry = Dict[str, Any]
+# candidate snippets scraped from one site snapshot, stored column-wise
+@dataclass(slots=True)
+class Candidates:
+    texts: List[str] = field(default_factory=list)
+    norms: List[str] = field(default_factory=list)
+    tokens: List[List[str]] = field(default_factory=list)
+    token_sets: List[FrozenSet[str]] = field(default_factory=list)
+    last_progress: List[int] = field(default_factory=list)
+    links: List[Optional[str]] = field(default_factory=list)
+    contexts: List[str] = field(default_factory=list)
 
+    def __len__(self) -> int:
+        return len(self.norms)
 
-class PaginationConfig(BaseModel):
-    strategy: Literal["query", "path"] = "query"
-    parameter: Optional[str] = None
-    template: Optional[str] = None
-    start: int = 1
-    pages: int = 1
+    def append(self, text: str, norm: str, link: Optional[str], context: str) -> None:
+        self.texts.append(text)
+        self.norms.append(norm)
+        # the same few tokens ("chapter", title words) repeat across thousands of entries;
+        # interning shares one string each and makes index lookups pointer compares
+        tokens = [sys.intern(token) for token in norm.split()]
+        self.tokens.append(tokens)
+        # built once here rather than on every structural check against a series title
+        self.token_sets.append(frozenset(tokens))
+        self.last_progress.append(last_progress_index(tokens))
+        self.links.append(link)
+        self.contexts.append(context)
+
+
+TokenIndex = Dict[str, List[int]]
+ChapterSignature = Tuple[str, float | str]
+
+
+# distinct candidate norms sorted by length, so the fuzzy pass only scores lengths that can reach
+# the cutoff and scores a repeated norm once; groups holds the candidate indices behind each norm
+@dataclass(slots=True)
+class LengthIndex:
+    lengths: List[int] = field(default_factory=list)
+    norms: List[str] = field(default_factory=list)
+    groups: List[List[int]] = field(default_factory=list)
+
+
+@dataclass(frozen=True, slots=True)
+class SiteAddress:
+    # string forms of Website.url needed on the hot paths, derived once per site version
+    url: str
+    host: str
+    netloc: str
 
 
 class InMemoryStore:
@@ -334,13 +497,27 @@ class InMemoryStore:
         self.series: Dict[str, Series] = {}
         self.site_cache: Dict[str, str] = {}
         self.site_cache_meta: Dict[str, datetime] = {}
+        self.candidates_cache: Dict[str, Tuple[int, Candidates, TokenIndex, LengthIndex]] = {}
+        self._series_terms: Optional[List[Dict[str, str]]] = None
+        self._canonical_map: Optional[Dict[str, str]] = None
+        self._series_tokens: Dict[str, FrozenSet[str]] = {}
+        self._websites_by_host: Optional[Dict[str, str]] = None
+        self._series_by_token: Optional[Dict[str, str]] = None
+        # keyed by record id; the cached entry is reused only while it belongs to the same
+        # model instance, and every mutation swaps in a new instance via model_copy
+        self._site_addresses: Dict[str, Tuple[Website, SiteAddress]] = {}
+        self._page_urls: Dict[str, Tuple[Website, List[str]]] = {}
+        self._record_dumps: Dict[str, Tuple[BaseModel, Dict[str, Any]]] = {}
+        self._dirty: Set[str] = set()
+        self._persist_event: Optional[asyncio.Event] = None
+        self._persist_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._persist_stopping = False
         self._load_from_disk()
 
     def add_site(self, payload: WebsiteCreate) -> Website:
         normalized = normalize_host(str(payload.url))
-        for existing in self.websites.values():
-            if normalize_host(str(existing.url)) == normalized:
-                raise HTTPException(status_code=409, detail="Website already tracked")
+        if normalized in self.websites_by_host:
+            raise HTTPException(status_code=409, detail="Website already tracked")
         site = Website(
             id=str(uuid4()),
             label=payload.label.strip(),
@@ -350,16 +527,23 @@ class InMemoryStore:
             chapter_url_template=normalize_optional_str(payload.chapter_url_template),
         )
         self.websites[site.id] = site
-        self._persist_websites()
+        self.websites_by_host[normalized] = site.id
+        self._schedule_persist("websites")
         return site
 
     def remove_site(self, site_id: str) -> None:
-        if site_id not in self.websites:
+        site = self.websites.get(site_id)
+        if site is None:
             raise HTTPException(status_code=404, detail="Website not found")
+        self._release_host(site)
         del self.websites[site_id]
+        self._site_addresses.pop(site_id, None)
+        self._page_urls.pop(site_id, None)
+        self._record_dumps.pop(site_id, None)
         self.site_cache.pop(site_id, None)
         self.site_cache_meta.pop(site_id, None)
-        self._persist_websites()
+        self.candidates_cache.pop(site_id, None)
+        self._schedule_persist("websites")
 
     def update_site(self, site_id: str, payload: WebsiteUpdate) -> Website:
         site = self.websites.get(site_id)
@@ -369,19 +553,19 @@ class InMemoryStore:
         update_data = payload.model_dump(exclude_unset=True)
         if "label" in update_data and update_data["label"] is not None:
             update_data["label"] = update_data["label"].strip()
+        normalized: Optional[str] = None
         if "url" in update_data and update_data["url"] is not None:
             normalized = normalize_host(str(update_data["url"]))
-            for existing_id, existing in self.websites.items():
-                if existing_id == site_id:
-                    continue
-                if normalize_host(str(existing.url)) == normalized:
-                    raise HTTPException(status_code=409, detail="Website already tracked")
+            if self.websites_by_host.get(normalized, site_id) != site_id:
+                raise HTTPException(status_code=409, detail="Website already tracked")
             # purge cached snapshot if the URL changes
             self.site_cache.pop(site_id, None)
             self.site_cache_meta.pop(site_id, None)
+            self.candidates_cache.pop(site_id, None)
         if "pagination" in update_data:
-            # allow clearing pagination by passing null
-            update_data["pagination"] = update_data["pagination"]
+            # keep the validated model (or None to clear it); model_copy does not re-validate, and
+            # the dumped dict would otherwise end up stored on the Website
+            update_data["pagination"] = payload.pagination
         if "series_url_template" in update_data:
             update_data["series_url_template"] = normalize_optional_str(
                 update_data["series_url_template"]
@@ -392,8 +576,11 @@ class InMemoryStore:
             )
 
         updated = site.model_copy(update=update_data)
+        if normalized is not None:
+            self._release_host(site)
+            self.websites_by_host[normalized] = site_id
         self.websites[site_id] = updated
-        self._persist_websites()
+        self._schedule_persist("websites")
         return updated
 
     def update_site_cookies(self, site_id: str, cookies: List[StoredCookie]) -> Website:
@@ -403,7 +590,7 @@ class InMemoryStore:
         timestamp = datetime.now(timezone.utc)
         updated = site.model_copy(update={"auth_cookies": cookies, "last_reauth_at": timestamp})
         self.websites[site_id] = updated
-        self._persist_websites()
+        self._schedule_persist("websites")
         return updated
 
     def add_series(self, payload: SeriesCreate) -> Series:
@@ -411,11 +598,9 @@ class InMemoryStore:
         if not title:
             raise HTTPException(status_code=400, detail="Title cannot be empty")
         aliases = normalize_aliases(payload.aliases)
-        candidate_tokens = series_tokens(title, aliases)
-        for existing in self.series.values():
-            existing_tokens = series_tokens(existing.title, getattr(existing, "aliases", []) or [])
-            if candidate_tokens & existing_tokens:
-                raise HTTPException(status_code=409, detail="Series already tracked")
+        candidate_tokens = frozenset(series_tokens(title, aliases))
+        if any(token in self.series_by_token for token in candidate_tokens):
+            raise HTTPException(status_code=409, detail="Series already tracked")
         record = Series(
             id=str(uuid4()),
             title=title,
@@ -424,14 +609,23 @@ class InMemoryStore:
             last_read_token=normalize_optional_str(payload.last_read_token),
         )
         self.series[record.id] = record
-        self._persist_series()
+        self._series_tokens[record.id] = candidate_tokens
+        for token in candidate_tokens:
+            self.series_by_token[token] = record.id
+        self._series_changed()
+        self._schedule_persist("series")
         return record
 
     def remove_series(self, series_id: str) -> None:
-        if series_id not in self.series:
+        record = self.series.get(series_id)
+        if record is None:
             raise HTTPException(status_code=404, detail="Series not found")
+        self._release_series_tokens(record)
         del self.series[series_id]
-        self._persist_series()
+        self._series_tokens.pop(series_id, None)
+        self._record_dumps.pop(series_id, None)
+        self._series_changed()
+        self._schedule_persist("series")
 
     def update_series(self, series_id: str, payload: SeriesUpdate) -> Series:
         record = self.series.get(series_id)
@@ -455,25 +649,32 @@ class InMemoryStore:
         if "last_read_token" in update_data:
             update_data["last_read_token"] = normalize_optional_str(update_data["last_read_token"])
 
-        candidate_tokens = series_tokens(candidate_title, candidate_aliases)
-        for existing_id, existing in self.series.items():
-            if existing_id == series_id:
-                continue
-            existing_tokens = series_tokens(existing.title, getattr(existing, "aliases", []) or [])
-            if candidate_tokens & existing_tokens:
+        candidate_tokens = frozenset(series_tokens(candidate_title, candidate_aliases))
+        for token in candidate_tokens:
+            if self.series_by_token.get(token, series_id) != series_id:
                 raise HTTPException(status_code=409, detail="Series already tracked")
 
         updated = record.model_copy(update=update_data)
+        self._release_series_tokens(record)
+        self._series_tokens[series_id] = candidate_tokens
+        for token in candidate_tokens:
+            self.series_by_token[token] = series_id
         self.series[series_id] = updated
-        self._persist_series()
+        self._series_changed()
+        self._schedule_persist("series")
         return updated
 
     def record_site_snapshot(
         self, site_id: str, body: str | None, timestamp: datetime | None = None
     ) -> None:
+        self.candidates_cache.pop(site_id, None)
         if body:
             self.site_cache[site_id] = body
             self.site_cache_meta[site_id] = timestamp or datetime.now(timezone.utc)
+            site = self.websites.get(site_id)
+            if site is not None:
+                # parse once per poll so /api/matches only reads the prepared entries
+                self.site_candidates(site, body)
         else:
             self.site_cache.pop(site_id, None)
             self.site_cache_meta.pop(site_id, None)
@@ -481,7 +682,7 @@ class InMemoryStore:
     def _load_from_disk(self) -> None:
         for payload in load_json_records(WEBSITES_FILE):
             try:
-                site = Website(**payload)
+                site = Website.model_validate(payload)
             except Exception as exc:  # noqa: BLE001
                 logger.warning("Skipping invalid site payload %s: %s", payload, exc)
                 continue
@@ -489,23 +690,196 @@ class InMemoryStore:
 
         for payload in load_json_records(SERIES_FILE):
             try:
-                record = Series(**payload)
+                record = Series.model_validate(payload)
             except Exception as exc:  # noqa: BLE001
                 logger.warning("Skipping invalid series payload %s: %s", payload, exc)
                 continue
             self.series[record.id] = record
 
-    def _persist_websites(self) -> None:
-        write_json_records(
-            WEBSITES_FILE,
-            [site.model_dump(mode="json") for site in self.websites.values()],
-        )
-
-    def _persist_series(self) -> None:
-        write_json_records(
-            SERIES_FILE,
-            [record.model_dump(mode="json") for record in self.series.values()],
+    @property
+    def websites_by_host(self) -> Dict[str, str]:
+        # built on first use: _load_from_disk runs before normalize_host is defined
+        if self._websites_by_host is None:
+            self._websites_by_host = {}
+            for site in self.websites.values():
+                self._websites_by_host.setdefault(self.site_address(site).host, site.id)
+        return self._websites_by_host
+
+    @property
+    def series_by_token(self) -> Dict[str, str]:
+        if self._series_by_token is None:
+            self._series_by_token = {}
+            for record in self.series.values():
+                for token in self.record_tokens(record):
+                    self._series_by_token.setdefault(token, record.id)
+        return self._series_by_token
+
+    def site_address(self, site: Website) -> SiteAddress:
+        cached = self._site_addresses.get(site.id)
+        if cached is not None and cached[0] is site:
+            return cached[1]
+        url = str(site.url)
+        address = SiteAddress(url=url, host=normalize_host(url), netloc=urlparse(url).netloc.lower())
+        self._site_addresses[site.id] = (site, address)
+        return address
+
+    def page_urls(self, site: Website) -> List[str]:
+        cached = self._page_urls.get(site.id)
+        if cached is not None and cached[0] is site:
+            return cached[1]
+        # a misconfigured pagination falls back to the base URL per page; fetch each URL once
+        urls = list(dict.fromkeys(build_page_urls(site)))
+        self._page_urls[site.id] = (site, urls)
+        return urls
+
+    def site_candidates(
+        self, site: Website, body: str
+    ) -> Tuple[Candidates, TokenIndex, LengthIndex]:
+        # normally filled by record_site_snapshot; rebuilt here only if the body changed since
+        digest = hash(body)
+        cached = self.candidates_cache.get(site.id)
+        if cached is not None and cached[0] == digest:
+            return (cached[1], cached[2], cached[3])
+        root = parse_html(body)
+        # an unparseable body is cached as empty so it isn't re-parsed on every request
+        candidates = (
+            Candidates() if root is None else extract_candidate_entries(root, str(site.url))
         )
+        token_index = build_token_index(candidates)
+        length_index = build_length_index(candidates)
+        self.candidates_cache[site.id] = (digest, candidates, token_index, length_index)
+        return (candidates, token_index, length_index)
+
+    def _release_host(self, site: Website) -> None:
+        host = self.site_address(site).host
+        if self.websites_by_host.get(host) != site.id:
+            return
+        # the index keeps one owner per key; records loaded from disk may share it, so hand the
+        # key to the next one instead of leaving that record unindexed
+        for other in self.websites.values():
+            if other.id != site.id and self.site_address(other).host == host:
+                self.websites_by_host[host] = other.id
+                return
+        del self.websites_by_host[host]
+
+    def record_tokens(self, record: Series) -> FrozenSet[str]:
+        # canonical title/alias tokens per series; filled on add/update, lazily for disk records
+        tokens = self._series_tokens.get(record.id)
+        if tokens is None:
+            tokens = frozenset(series_tokens(record.title, record.aliases))
+            self._series_tokens[record.id] = tokens
+        return tokens
+
+    def _release_series_tokens(self, record: Series) -> None:
+        for token in self.record_tokens(record):
+            if self.series_by_token.get(token) != record.id:
+                continue
+            # same as _release_host: aliases of disk-loaded records can collide
+            owner = next(
+                (
+                    other_id
+                    for other_id, other in self.series.items()
+                    if other_id != record.id and token in self.record_tokens(other)
+                ),
+                None,
+            )
+            if owner is None:
+                del self.series_by_token[token]
+            else:
+                self.series_by_token[token] = owner
+
+    @property
+    def series_terms(self) -> List[Dict[str, str]]:
+        # titles only change on mutation, so normalize them once rather than per /api/matches call
+        if self._series_terms is None:
+            self._series_terms = build_series_terms(self.series.values())
+        return self._series_terms
+
+    @property
+    def canonical_map(self) -> Dict[str, str]:
+        if self._canonical_map is None:
+            self._canonical_map = build_canonical_map(self.series.values(), self.record_tokens)
+        return self._canonical_map
+
+    def _series_changed(self) -> None:
+        self._series_terms = None
+        self._canonical_map = None
+
+    def _schedule_persist(self, kind: str) -> None:
+        # mutations run in the threadpool; hand the write to the worker on the event loop
+        if self._persist_event is None or self._persist_loop is None:
+            self._write_records(kind)
+            return
+        # _dirty is only touched on the loop, so the worker's swap can't drop a mark
+        self._persist_loop.call_soon_threadsafe(self._mark_dirty, kind)
+
+    def _mark_dirty(self, kind: str) -> None:
+        if self._persist_event is None:
+            # the worker exited between scheduling and this callback; write it directly
+            self._write_records(kind)
+            return
+        self._dirty.add(kind)
+        self._persist_event.set()
+
+    def _persist_payload(self, kind: str) -> Tuple[Path, List[Dict]]:
+        # list() snapshots the dict so a concurrent mutation can't break iteration
+        if kind == "websites":
+            records: List[Tuple[str, BaseModel]] = list(self.websites.items())
+            path = WEBSITES_FILE
+        else:
+            records = list(self.series.items())
+            path = SERIES_FILE
+        return (path, [self._record_dump(record_id, record) for record_id, record in records])
+
+    def _record_dump(self, record_id: str, record: BaseModel) -> Dict[str, Any]:
+        # a mutation re-dumps only the record it replaced, not the whole collection
+        cached = self._record_dumps.get(record_id)
+        if cached is not None and cached[0] is record:
+            return cached[1]
+        dumped = record.model_dump(mode="json")
+        self._record_dumps[record_id] = (record, dumped)
+        return dumped
+
+    def _write_records(self, kind: str) -> None:
+        path, payload = self._persist_payload(kind)
+        write_json_records(path, payload)
+
+    async def persist_worker(self) -> None:
+        self._persist_loop = asyncio.get_running_loop()
+        self._persist_stopping = False
+        event = asyncio.Event()
+        self._persist_event = event
+        try:
+            while True:
+                await event.wait()
+                if not self._persist_stopping:
+                    # let a burst of mutations land, then write each dirty file once
+                    await asyncio.sleep(PERSIST_COALESCE_SECONDS)
+                event.clear()
+                pending, self._dirty = self._dirty, set()
+                for kind in sorted(pending):
+                    path, payload = self._persist_payload(kind)
+                    try:
+                        await asyncio.to_thread(write_json_records, path, payload)
+                    except OSError:
+                        logger.exception("Failed to persist %s", path.name)
+                if self._persist_stopping:
+                    return
+        finally:
+            self._persist_event = None
+            self._persist_loop = None
+
+    def stop_persisting(self) -> None:
+        # the worker finishes its current write and drains what is pending, then exits;
+        # cancelling it instead would leave a to_thread write running behind the final flush
+        self._persist_stopping = True
+        if self._persist_event is not None:
+            self._persist_event.set()
+
+    def flush_persisted(self) -> None:
+        # unchanged files are skipped by write_json_records, so this is cheap when nothing is pending
+        self._write_records("websites")
+        self._write_records("series")
 
 
 store = InMemoryStore()
@@ -538,19 +912,52 @@ mock_catalogs: Dict[str, List[str]] = {
 
 @app.on_event("startup")
 async def start_poller() -> None:
-    global poller_task
+    global poller_task, http_transport, cookie_executor, site_fetch_semaphore
+    if http_transport is None:
+        http_transport = build_http_transport()
+    if site_fetch_semaphore is None:
+        site_fetch_semaphore = asyncio.Semaphore(MAX_CONCURRENT_SITE_FETCHES)
+    if cookie_executor is None:
+        cookie_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="cookies")
+    cookie_wait_cancelled.clear()
     if poller_task is None:
         poller_task = asyncio.create_task(poll_sites_loop())
 
 
 @app.on_event("shutdown")
 async def stop_poller() -> None:
-    global poller_task
+    global poller_task, http_transport, cookie_executor, site_fetch_semaphore
     if poller_task:
         poller_task.cancel()
         with suppress(asyncio.CancelledError):
             await poller_task
         poller_task = None
+    if http_transport is not None:
+        await http_transport.aclose()
+        http_transport = None
+    site_fetch_semaphore = None
+    # release any reauth request still waiting on browser cookies
+    cookie_wait_cancelled.set()
+    if cookie_executor is not None:
+        cookie_executor.shutdown(wait=False, cancel_futures=True)
+        cookie_executor = None
+
+
+@app.on_event("startup")
+async def start_persist_worker() -> None:
+    global persist_task
+    if persist_task is None:
+        persist_task = asyncio.create_task(store.persist_worker())
+
+
+@app.on_event("shutdown")
+async def stop_persist_worker() -> None:
+    global persist_task
+    if persist_task:
+        store.stop_persisting()
+        await persist_task
+        persist_task = None
+    store.flush_persisted()
 
 
 @app.get("/health")
@@ -559,8 +966,10 @@ def healthcheck() -> Dict[str, str]:
 
 
 @app.get("/api/sites", response_model=List[WebsitePublic])
-def list_sites() -> List[WebsitePublic]:
-    return [site_to_public(site) for site in store.websites.values()]
+def list_sites() -> Response:
+    return json_response(
+        [site.model_dump(mode="json", include=PUBLIC_SITE_FIELDS) for site in store.websites.values()]
+    )
 
 
 @app.post("/api/sites", response_model=WebsitePublic, status_code=201)
@@ -582,7 +991,7 @@ async def reauthenticate_site(site_id: str, payload: ReauthRequest = ReauthReque
     site = store.websites.get(site_id)
     if site is None:
         raise HTTPException(status_code=404, detail="Website not found")
-    host = normalize_host(str(site.url))
+    host = store.site_address(site).host
     if not host:
         raise HTTPException(status_code=400, detail="Unable to determine host for website")
     manual_entries = {k: v for k, v in (payload.manual_cookies or {}).items() if v}
@@ -610,17 +1019,17 @@ async def reauthenticate_site(site_id: str, payload: ReauthRequest = ReauthReque
     include_names = {name.lower() for name in payload.include_names} if payload.include_names else None
     wait_seconds = max(5, min(payload.wait_seconds or 0, 180))
     deadline = time.monotonic() + wait_seconds
-    while True:
-        cookies = await asyncio.to_thread(collect_browser_cookies, host, include_names)
-        if cookies:
-            updated = store.update_site_cookies(site_id, cookies)
-            return ReauthResponse(cookies_found=len(cookies), last_reauth_at=updated.last_reauth_at)
-        if time.monotonic() >= deadline:
-            raise HTTPException(
-                status_code=408,
-                detail="Cloudflare cookies were not detected. Complete the verification challenge and try again.",
-            )
-        await asyncio.sleep(2.0)
+    # outside the app lifespan there is no dedicated pool; the loop's default one will do
+    cookies = await asyncio.get_running_loop().run_in_executor(
+        cookie_executor, wait_for_browser_cookies, host, include_names, deadline
+    )
+    if not cookies:
+        raise HTTPException(
+            status_code=408,
+            detail="Cloudflare cookies were not detected. Complete the verification challenge and try again.",
+        )
+    updated = store.update_site_cookies(site_id, cookies)
+    return ReauthResponse(cookies_found=len(cookies), last_reauth_at=updated.last_reauth_at)
 
 
 @app.delete("/api/sites/{site_id}", status_code=204)
@@ -630,8 +1039,8 @@ def delete_site(site_id: str) -> Response:
 
 
 @app.get("/api/series", response_model=List[Series])
-def list_series() -> List[Series]:
-    return list(store.series.values())
+def list_series() -> Response:
+    return json_response([record.model_dump(mode="json") for record in store.series.values()])
 
 
 @app.post("/api/series", response_model=Series, status_code=201)
@@ -651,27 +1060,36 @@ def delete_series(series_id: str) -> Response:
 
 
 @app.get("/api/matches", response_model=List[Match])
-async def now_reading() -> List[Match]:
+async def now_reading() -> Response:
     if not store.websites or not store.series:
-        return []
+        return matches_response([])
 
-    series_terms = build_series_terms(store.series.values())
+    series_terms = store.series_terms
     if not series_terms:
-        return []
+        return matches_response([])
 
-    canonical_map = build_canonical_map(store.series.values())
+    canonical_map = store.canonical_map
 
     websites = list(store.websites.values())
     matches, missing_cache = await scan_sites_for_series(websites, series_terms)
     if matches:
-        return matches
+        return matches_response(matches)
 
     if missing_cache:
         logger.info("Cache missing for some sites, triggering async refresh")
         asyncio.create_task(refresh_site_cache(websites))
 
     # Fallback to mock catalogs when live scanning yields nothing
-    return collect_mock_matches(websites, canonical_map)
+    return matches_response(collect_mock_matches(websites, canonical_map))
+
+
+def matches_response(matches: List[Match]) -> Response:
+    return json_response([match.model_dump(mode="json") for match in matches])
+
+
+def json_response(payload: List[Dict[str, Any]]) -> Response:
+    # serialize directly so list payloads skip response_model validation and jsonable_encoder
+    return Response(content=orjson.dumps(payload), media_type="application/json")
 
 
 def _get_index_file() -> Path:
@@ -683,21 +1101,28 @@ def _get_index_file() -> Path:
     )
 
 
-@app.get("/", include_in_schema=False)
-def serve_index() -> FileResponse:
-    return FileResponse(_get_index_file())
+class SPAStaticFiles(StaticFiles):
+    # serves the built frontend; unknown paths fall back to index.html for client-side routes
+    async def check_config(self) -> None:
+        # a missing build is reported per request (503) instead of crashing the app
+        if FRONTEND_DIST.is_dir():
+            await super().check_config()
 
+    async def get_response(self, path: str, scope: Any) -> Response:
+        try:
+            return await super().get_response(path, scope)
+        except StarletteHTTPException as exc:
+            if exc.status_code != 404 or path.startswith("api"):
+                raise
+        return FileResponse(_get_index_file(), headers={"cache-control": INDEX_CACHE_CONTROL})
 
-@app.get("/{full_path:path}", include_in_schema=False)
-def serve_spa(full_path: str) -> FileResponse:
-    if full_path.startswith("api"):
-        raise HTTPException(status_code=404, detail="Not found")
-
-    candidate = FRONTEND_DIST / full_path
-    if candidate.exists() and candidate.is_file():
-        return FileResponse(candidate)
-
-    return FileResponse(_get_index_file())
+    def file_response(
+        self, full_path: Any, stat_result: os.stat_result, scope: Any, status_code: int = 200
+    ) -> Response:
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        if str(full_path).endswith(".html"):
+            response.headers["cache-control"] = INDEX_CACHE_CONTROL
+        return response
 
 
 async def scan_sites_for_series(
@@ -706,7 +1131,8 @@ async def scan_sites_for_series(
     if not websites or not series_terms:
         return ([], False)
 
-    return matches_from_cache(websites, series_terms)
+    # matching is CPU-bound; keep the event loop free for other requests and the poller
+    return await asyncio.to_thread(matches_from_cache, websites, series_terms)
 
 
 def matches_from_cache(
@@ -722,25 +1148,29 @@ def matches_from_cache(
         if not body:
             missing_cache = True
             continue
-        soup = build_soup(body)
-        if soup is None:
-            continue
-        source_label = site.label or normalize_host(str(site.url))
+        candidates, token_index, length_index = store.site_candidates(site, body)
+        address = store.site_address(site)
+        source_label = site.label or address.host
         series_template = site.series_url_template
         chapter_template = site.chapter_url_template
-        site_host = urlparse(str(site.url)).netloc.lower()
-        candidates = extract_candidate_entries(soup, str(site.url))
+        site_host = address.netloc
         detected_at = store.site_cache_meta.get(site.id)
         for term in series_terms:
-            search_label = term["search"]
             display_title = term["display"]
-            hit = locate_series_hit(candidates, search_label, str(site.url), detected_at)
+            hit = locate_series_hit(
+                candidates,
+                term["norm"],
+                address.url,
+                detected_at,
+                token_index=token_index,
+                length_index=length_index,
+            )
             if not hit:
                 continue
             link, chapter_label, chapter_number, chapter_list = hit
             match_index.setdefault(display_title, {})[source_label] = SourceHit(
                 site=source_label,
-                link=link or str(site.url),
+                link=link or address.url,
                 latest_chapter=chapter_label,
                 latest_chapter_number=chapter_number,
                 recent_chapters=chapter_list,
@@ -768,38 +1198,80 @@ async def refresh_site_cache(websites: List[Website] | None = None) -> None:
     timestamp = datetime.now(timezone.utc)
     for site, body in zip(targets, bodies):
         log_site_body(site, body)
-        store.record_site_snapshot(site.id, body or None, timestamp)
+        # recording a snapshot parses it, which would otherwise stall the event loop
+        await asyncio.to_thread(store.record_site_snapshot, site.id, body or None, timestamp)
 
 
-async def fetch_site_bodies(websites: List[Website]) -> List[str]:
-    if not websites:
-        return []
-    async with httpx.AsyncClient(
+def build_http_transport() -> httpx.AsyncHTTPTransport:
+    return httpx.AsyncHTTPTransport(http2=True, limits=SCAN_LIMITS)
+
+
+def build_http_client(transport: httpx.AsyncBaseTransport) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
         follow_redirects=True,
         timeout=SCAN_TIMEOUT,
         headers={"user-agent": USER_AGENT},
-    ) as client:
+        transport=transport,
+    )
+
+
+async def fetch_site_bodies(websites: List[Website]) -> List[str]:
+    if not websites:
+        return []
+    # outside the app lifespan the cap only spans this run
+    site_semaphore = site_fetch_semaphore or asyncio.Semaphore(MAX_CONCURRENT_SITE_FETCHES)
+    if http_transport is not None:
+        # polls, site refreshes and /api/matches can overlap, so each run gets its own client
+        # and cookie jar over the shared transport; pooled connections and TLS sessions still
+        # survive between runs. It is not closed, since closing would close the transport.
+        client = build_http_client(http_transport)
         return await asyncio.gather(
-            *[fetch_site_body(client, site) for site in websites]
+            *[fetch_site_body(client, site, site_semaphore) for site in websites]
+        )
+    async with build_http_client(build_http_transport()) as client:
+        return await asyncio.gather(
+            *[fetch_site_body(client, site, site_semaphore) for site in websites]
+        )
+
+
+async def fetch_site_body(
+    client: httpx.AsyncClient, site: Website, site_semaphore: asyncio.Semaphore
+) -> str:
+    page_urls = store.page_urls(site)
+    cookie_values = site_cookie_values(site) or None
+    # pages share one multiplexed connection; cap in-flight requests so a long
+    # pagination run does not hammer a single host
+    semaphore = asyncio.Semaphore(MAX_PAGE_FETCHES_PER_SITE)
+    async with site_semaphore:
+        pages = await asyncio.gather(
+            *[fetch_site_page(client, page_url, cookie_values, semaphore) for page_url in page_urls]
         )
+    return "\n<!--page-break-->\n".join(page for page in pages if page is not None)
 
 
-async def fetch_site_body(client: httpx.AsyncClient, site: Website) -> str:
-    page_urls = build_page_urls(site)
-    pages: List[str] = []
-    cookie_values = site_cookie_values(site)
-    for page_url in page_urls:
+async def fetch_site_page(
+    client: httpx.AsyncClient,
+    page_url: str,
+    cookie_values: Optional[Dict[str, str]],
+    semaphore: asyncio.Semaphore,
+) -> Optional[str]:
+    async with semaphore:
         try:
-            response = await client.get(page_url, cookies=cookie_values or None)
-            response.raise_for_status()
-            text = response.text
-            if len(text) > MAX_RESPONSE_BYTES:
-                text = text[:MAX_RESPONSE_BYTES]
-            pages.append(text)
+            # stop reading once the cap is reached instead of downloading and decoding the whole page
+            async with client.stream("GET", page_url, cookies=cookie_values) as response:
+                response.raise_for_status()
+                buffer = bytearray()
+                async for chunk in response.aiter_bytes():
+                    buffer += chunk
+                    if len(buffer) >= MAX_RESPONSE_BYTES:
+                        break
+                encoding = response.encoding or "utf-8"
         except httpx.HTTPError as exc:
             logger.warning("Failed to scan %s: %s", page_url, exc)
-            continue
-    return "\n<!--page-break-->\n".join(pages)
+            return None
+    # trim in place rather than slicing a second copy of up to a megabyte
+    del buffer[MAX_RESPONSE_BYTES:]
+    return buffer.decode(encoding, errors="replace")
 
 
 def log_site_body(site: Website, body: str) -> None:
@@ -813,21 +1285,9 @@ def log_site_body(site: Website, body: str) -> None:
 
 
 def build_page_urls(site: Website) -> List[str]:
-    config_data = site.pagination
+    config = site.pagination
     base_url = str(site.url)
-    if not config_data:
-        return [base_url]
-
-    if isinstance(config_data, PaginationConfig):
-        config = config_data
-    elif isinstance(config_data, dict):
-        try:
-            config = PaginationConfig(**config_data)
-        except ValidationError as exc:
-            logger.warning("Invalid pagination config for %s: %s", site.id, exc)
-            return [base_url]
-    else:
-        logger.warning("Unsupported pagination config type for %s: %s", site.id, type(config_data))
+    if not config:
         return [base_url]
 
     pages = max(1, config.pages or 1)
@@ -846,33 +1306,49 @@ def build_page_urls(site: Website) -> List[str]:
 
 
 def apply_query_pagination(base_url: str, parameter: str, page_number: int) -> str:
-    parsed = urlparse(base_url)
-    query = parse_qs(parsed.query, keep_blank_values=True)
-    query[parameter] = [str(page_number)]
-    new_query = urlencode(query, doseq=True)
-    updated = parsed._replace(query=new_query)
-    return urlunparse(updated)
-
-
-def extract_candidate_entries(soup: BeautifulSoup, base_url: str) -> List[CandidateEntry]:
-    entries: List[CandidateEntry] = []
-    tags = soup.find_all(CANDIDATE_TAGS)
-    for element in tags:
-        href = element.get("href")
-        link = urljoin(base_url, href) if href else None
-        parent_text = (
-            element.parent.get_text(" ", strip=True) if element.parent is not None else ""
-        )
+    # called for every page on every poll; swap the one key in place instead of re-encoding the query
+    url, hash_mark, fragment = base_url.partition("#")
+    key = quote_plus(parameter)
+    pair = f"{key}={page_number}"
+    if "?" not in url:
+        return f"{url}?{pair}{hash_mark}{fragment}"
+    updated, count = re.subn(rf"(?<=[?&]){re.escape(key)}(?:=[^&]*)?(?=&|$)", pair, url)
+    if not count:
+        separator = "" if url.endswith(("?", "&")) else "&"
+        updated = f"{url}{separator}{pair}"
+    return f"{updated}{hash_mark}{fragment}"
+
+
+def extract_candidate_entries(root: lxml.html.HtmlElement, base_url: str) -> Candidates:
+    entries = Candidates()
+    for stripped in root.xpath(STRIPPED_ELEMENTS_XPATH):
+        stripped.drop_tree()
+    # siblings share a parent, so flatten each parent's text once instead of per child;
+    # keyed by the element itself, which keeps lxml's proxy alive and therefore stable
+    parent_texts: Dict[Any, str] = {}
+    for element in root.iter(*CANDIDATE_TAGS):
         snippets: List[str] = []
-        text = element.get_text(" ", strip=True)
-        if text:
+        text = element_text(element)
+        if MIN_SNIPPET_LENGTH <= len(text) <= MAX_SNIPPET_LENGTH:
             snippets.append(text)
         for attr in ATTRIBUTE_TEXT_FIELDS:
             value = element.get(attr)
             if isinstance(value, str):
                 candidate = value.strip()
-                if candidate:
+                if MIN_SNIPPET_LENGTH <= len(candidate) <= MAX_SNIPPET_LENGTH:
                     snippets.append(candidate)
+        if not snippets:
+            continue
+        href = element.get("href")
+        link = urljoin(base_url, href) if href else None
+        parent = element.getparent()
+        if parent is None:
+            parent_text = ""
+        else:
+            cached: Optional[str] = parent_texts.get(parent)
+            if cached is None:
+                cached = parent_texts[parent] = element_text(parent)
+            parent_text = cached
         seen_snippets: Set[str] = set()
         for snippet in snippets:
             if snippet in seen_snippets:
@@ -882,43 +1358,122 @@ def extract_candidate_entries(soup: BeautifulSoup, base_url: str) -> List[Candid
             if not norm:
                 continue
             context = parent_text if parent_text and parent_text != snippet else ""
-            entries.append(
-                {
-                    "text": snippet,
-                    "norm": norm,
-                    "tokens": norm.split(),
-                    "link": link,
-                    "context": context,
-                }
-            )
+            entries.append(snippet, norm, link, context)
             if len(entries) >= MAX_CANDIDATE_ELEMENTS:
                 return entries
     return entries
 
 
+def element_text(element: lxml.html.HtmlElement) -> str:
+    # stripped text nodes joined by single spaces; itertext already skips comments
+    return " ".join(chunk for chunk in (piece.strip() for piece in element.itertext()) if chunk)
+
+
+def build_token_index(candidates: Candidates) -> TokenIndex:
+    postings: TokenIndex = defaultdict(list)
+    for index, token_set in enumerate(candidates.token_sets):
+        for token in token_set:
+            postings[token].append(index)
+    return dict(postings)
+
+
+def build_length_index(candidates: Candidates) -> LengthIndex:
+    groups: Dict[str, List[int]] = defaultdict(list)
+    for index, norm in enumerate(candidates.norms):
+        groups[norm].append(index)
+    norms = sorted(groups, key=len)
+    return LengthIndex(
+        lengths=[len(norm) for norm in norms],
+        norms=norms,
+        groups=[groups[norm] for norm in norms],
+    )
+
+
+def prune_candidates(
+    normalized_title: str,
+    title_set: FrozenSet[str],
+    token_index: TokenIndex,
+    length_index: LengthIndex,
+) -> List[int]:
+    # every non-fuzzy branch of is_structural_match needs all title tokens, so intersect their
+    # postings starting from the rarest; the >= 0.9 ratio branch does not, so those hits come
+    # from a rapidfuzz pass over the candidates whose length allows that ratio at all
+    postings = sorted((token_index.get(token, ()) for token in title_set), key=len)
+    hits: Set[int] = set(postings[0]) if postings else set()
+    for posting in postings[1:]:
+        if not hits:
+            break
+        hits.intersection_update(posting)
+    # ratio >= 0.9 needs 2 * min(len) >= 0.9 * (sum of lens), i.e. a length within 9/11..11/9
+    # of the title; one char of slack on each side keeps float rounding out of it
+    title_length = len(normalized_title)
+    lengths = length_index.lengths
+    start = bisect_left(lengths, title_length * 9 // 11 - 1)
+    stop = bisect_right(lengths, title_length * 11 // 9 + 1)
+    groups = length_index.groups
+    for _, _, offset in process.extract(
+        normalized_title,
+        length_index.norms[start:stop],
+        scorer=Indel.normalized_similarity,
+        score_cutoff=0.9,
+        limit=None,
+    ):
+        hits.update(groups[start + offset])
+    return sorted(hits)
+
+
 def locate_series_hit(
-    candidates: List[CandidateEntry],
-    title: str,
+    candidates: Candidates,
+    normalized_title: str,
     site_url: str,
     detected_at: Optional[datetime] = None,
+    token_index: Optional[TokenIndex] = None,
+    length_index: Optional[LengthIndex] = None,
 ) -> Optional[Tuple[Optional[str], Optional[str], Optional[float], List[ChapterListing]]]:
-    normalized_title = normalize_text(title)
     if not normalized_title:
         return None
     title_tokens = normalized_title.split()
+    # built once per term rather than on every structural check
+    title_set = frozenset(title_tokens)
     best: Tuple[float, Optional[str], Optional[str], Optional[float]] | None = None
     chapter_entries: List[ChapterListing] = []
-    seen_chapter_keys: set[str] = set()
-    for entry in candidates:
-        candidate_norm = entry["norm"]
-        tokens = entry["tokens"]
-        if not is_structural_match(normalized_title, title_tokens, candidate_norm, tokens):
+    seen_chapter_keys: set[ChapterSignature] = set()
+    norms = candidates.norms
+    indices: Iterable[int] = (
+        prune_candidates(normalized_title, title_set, token_index, length_index)
+        if token_index is not None and length_index is not None
+        else range(len(candidates))
+    )
+    # one native call scores every surviving candidate instead of a ratio call per match;
+    # Indel.normalized_similarity is fuzz.ratio on a 0..1 scale, without the * 100 / 100 round trip
+    # keyed by norm, so candidates that normalize alike are scored once
+    scores = {
+        norm: score
+        for norm, score, _ in process.extract(
+            normalized_title,
+            list({norms[index]: None for index in indices}),
+            scorer=Indel.normalized_similarity,
+            limit=None,
+        )
+    }
+    for index in indices:
+        candidate_norm = norms[index]
+        ratio = scores[candidate_norm]
+        if not is_structural_match(
+            normalized_title,
+            title_tokens,
+            title_set,
+            candidate_norm,
+            candidates.tokens[index],
+            candidates.token_sets[index],
+            candidates.last_progress[index],
+            ratio,
+        ):
             continue
-        ratio = SequenceMatcher(None, normalized_title, candidate_norm).ratio()
         chapter_label, chapter_number = extract_chapter_details(
-            entry["text"], entry.get("context")
+            candidates.texts[index], candidates.contexts[index]
         )
-        link = entry["link"] or site_url
+        link = candidates.links[index] or site_url
         if chapter_label:
             key = build_chapter_signature(chapter_label, chapter_number)
             if key and key not in seen_chapter_keys:
@@ -936,10 +1491,11 @@ def locate_series_hit(
     if best is None:
         return None
 
-    ordered = sort_chapter_entries(chapter_entries)
+    ordered = sort_chapter_entries(chapter_entries, limit=RECENT_CHAPTER_LIMIT)
     if best[2]:
         signature = build_chapter_signature(best[2], best[3])
-        if signature and signature not in {build_chapter_signature(item.label, item.number) for item in ordered}:
+        # seen_chapter_keys holds the signature of every entry in ordered
+        if signature and signature not in seen_chapter_keys:
             ordered.insert(
                 0,
                 ChapterListing(
@@ -958,39 +1514,38 @@ def locate_series_hit(
                 detected_at=detected_at,
             )
         ]
-    return (best[1], best[2], best[3], ordered[:5])
+    return (best[1], best[2], best[3], ordered[:RECENT_CHAPTER_LIMIT])
 
 
-def build_chapter_signature(label: Optional[str], number: Optional[float]) -> Optional[str]:
+def build_chapter_signature(
+    label: Optional[str], number: Optional[float]
+) -> Optional[ChapterSignature]:
+    # tuples hash without formatting a string; numbers come from plain digit runs, so no
+    # -0.0 or nan can make two equal tuples differ from their old string keys
     if number is not None:
-        return f"num:{number}"
+        return ("num", number)
     if label:
-        return f"label:{label.strip().casefold()}"
+        return ("label", label.strip().casefold())
     return None
 
 
-def sort_chapter_entries(entries: List[ChapterListing]) -> List[ChapterListing]:
+def sort_chapter_entries(
+    entries: List[ChapterListing], limit: Optional[int] = None
+) -> List[ChapterListing]:
     if not entries:
         return []
-    return sorted(
-        entries,
-        key=lambda item: (
+
+    def sort_key(item: ChapterListing) -> Tuple[int, float, str]:
+        return (
             0 if item.number is not None else 1,
             -(item.number if item.number is not None else 0.0),
             item.label or "",
-        ),
-    )
-
-
-def normalize_text(value: str) -> str:
-    value = value.casefold()
-    value = re.sub(r"[^a-z0-9\s]", " ", value)
-    return " ".join(value.split())
-
+        )
 
-def canonicalize_title(value: str) -> str:
-    cleaned = normalize_text(value or "")
-    return re.sub(r"\s+", "", cleaned)
+    if limit is not None:
+        # same order as sorted()[:limit] without sorting the whole list
+        return heapq.nsmallest(limit, entries, key=sort_key)
+    return sorted(entries, key=sort_key)
 
 
 def normalize_aliases(values: Iterable[str] | None) -> List[str]:
@@ -1013,96 +1568,49 @@ def normalize_aliases(values: Iterable[str] | None) -> List[str]:
 
 
 def series_tokens(title: str, aliases: Iterable[str] | None = None) -> set[str]:
-    tokens: set[str] = set()
-    values: List[str] = []
-    if title:
-        values.append(title)
-    if aliases:
-        values.extend(aliases)
-    for value in values:
-        token = canonicalize_title(value)
-        if token:
-            tokens.add(token)
-    return tokens
+    # canonicalize_title maps empty names to "", which the filter drops
+    return {token for token in map(canonicalize_title, chain((title,), aliases or ())) if token}
 
 
 def build_series_terms(records: Iterable[Series]) -> List[Dict[str, str]]:
     terms: List[Dict[str, str]] = []
     for record in records:
         display = record.title
-        names = [record.title]
-        if record.aliases:
-            names.extend(record.aliases)
-        for name in names:
+        for name in chain((display,), record.aliases or ()):
             candidate = name.strip()
             if not candidate:
                 continue
-            canonical = canonicalize_title(candidate)
-            if not canonical:
+            # one casefold per name: the canonical form is the normalized one without spaces
+            norm = normalize_text(candidate)
+            if not norm:
                 continue
-            terms.append({"display": display, "search": candidate, "canonical": canonical})
+            terms.append(
+                {
+                    "display": display,
+                    "search": candidate,
+                    "canonical": norm.replace(" ", ""),
+                    "norm": norm,
+                }
+            )
     return terms
 
 
-def build_canonical_map(records: Iterable[Series]) -> Dict[str, str]:
+def build_canonical_map(
+    records: Iterable[Series], record_tokens: Callable[[Series], FrozenSet[str]]
+) -> Dict[str, str]:
     mapping: Dict[str, str] = {}
     for record in records:
-        for token in series_tokens(record.title, record.aliases):
+        for token in record_tokens(record):
             if token and token not in mapping:
                 mapping[token] = record.title
     return mapping
 
 
-PROGRESS_KEYWORDS = {"chapter", "chap", "ch", "vol", "volume", "episode", "ep", "season"}
-PROGRESS_PREFIXES = tuple(sorted(PROGRESS_KEYWORDS, key=len, reverse=True))
-
-
-def contains_progress_keyword(tokens: List[str]) -> bool:
-    for token in tokens:
-        if token in PROGRESS_KEYWORDS:
-            return True
-        for prefix in PROGRESS_PREFIXES:
-            if token.startswith(prefix) and token != prefix:
-                suffix = token[len(prefix) :]
-                if suffix.isdigit():
-                    return True
-    return False
-
-
-def is_structural_match(
-    normalized_title: str,
-    title_tokens: List[str],
-    candidate_norm: str,
-    candidate_tokens: List[str],
-) -> bool:
-    if not candidate_norm:
-        return False
-    ratio = SequenceMatcher(None, normalized_title, candidate_norm).ratio()
-    if ratio >= 0.9:
-        return True
-
-    token_set = set(candidate_tokens)
-    title_set = set(title_tokens)
-    if len(title_tokens) >= 2 and title_set.issubset(token_set) and ratio >= 0.75:
-        return True
-
-    if len(title_tokens) >= 2 and len(candidate_tokens) > len(title_tokens):
-        prefix = candidate_tokens[: len(title_tokens)]
-        remainder = candidate_tokens[len(title_tokens) :]
-        if prefix == title_tokens and contains_progress_keyword(remainder):
-            return True
-
-    if len(title_tokens) == 1:
-        title_token = title_tokens[0]
-        if candidate_norm == title_token:
-            return True
-        if (
-            candidate_tokens
-            and candidate_tokens[0] == title_token
-            and contains_progress_keyword(candidate_tokens[1:])
-        ):
-            return True
-    return False
+# the mock catalogs are constant, so canonicalize them once instead of per request
+MOCK_INDEX: Dict[str, Dict[str, str]] = {
+    host: {canonicalize_title(title): title for title in catalog}
+    for host, catalog in mock_catalogs.items()
+}
 
 
 def collect_mock_matches(
@@ -1113,24 +1621,32 @@ def collect_mock_matches(
 
     match_index: Dict[str, Dict[str, SourceHit]] = {}
     for site in websites:
-        host = normalize_host(str(site.url))
-        catalog = mock_catalogs.get(host)
+        address = store.site_address(site)
+        host = address.host
+        catalog = MOCK_INDEX.get(host)
         if not catalog:
             continue
         source_label = site.label or host
-        for candidate in catalog:
-            key = canonicalize_title(candidate)
-            if key not in canonical_map:
+        site_url = address.url
+        site_host = address.netloc
+        series_template = site.series_url_template
+        chapter_template = site.chapter_url_template
+        for key in catalog:
+            title = canonical_map.get(key)
+            if title is None:
                 continue
-            match_index.setdefault(canonical_map[key], {})[source_label] = SourceHit(
+            bucket = match_index.get(title)
+            if bucket is None:
+                bucket = match_index[title] = {}
+            bucket[source_label] = SourceHit(
                 site=source_label,
-                link=str(site.url),
+                link=site_url,
                 latest_chapter=None,
                 latest_chapter_number=None,
                 recent_chapters=[],
-                series_url_template=site.series_url_template,
-                chapter_url_template=site.chapter_url_template,
-                site_host=urlparse(str(site.url)).netloc.lower(),
+                series_url_template=series_template,
+                chapter_url_template=chapter_template,
+                site_host=site_host,
             )
     return serialize_matches(match_index)
 
@@ -1153,55 +1669,57 @@ def serialize_matches(match_index: Dict[str, Dict[str, SourceHit]]) -> List[Matc
     return results
 
 
-def build_soup(html: str) -> Optional[BeautifulSoup]:
+HTML_PARSER = lxml.html.HTMLParser(encoding="utf-8")
+
+
+def parse_html(html: str) -> Optional[lxml.html.HtmlElement]:
+    # fed as bytes with an explicit encoding so meta charset tags and XML declarations in the
+    # already-decoded body can't trip the parser
+    if not html or html.isspace():
+        return None
     try:
-        return BeautifulSoup(html, "html.parser")
-    except Exception as exc:  # noqa: BLE001
+        return lxml.html.document_fromstring(html.encode("utf-8"), parser=HTML_PARSER)
+    except (etree.ParserError, ValueError) as exc:
         logger.warning("Failed to parse HTML for metadata extraction: %s", exc)
         return None
-def extract_chapter_details(
-    primary: Optional[str], secondary: Optional[str] = None
-) -> Tuple[Optional[str], Optional[float]]:
-    for snippet in (primary, secondary):
-        if not snippet:
-            continue
-        label, number = detect_chapter_in_snippet(snippet)
-        if label:
-            return (label, number)
-    return (None, None)
-
-
-def detect_chapter_in_snippet(snippet: str) -> Tuple[Optional[str], Optional[float]]:
-    match = CHAPTER_REGEX.search(snippet)
-    if match:
-        label = match.group(1).strip()
-        return (label, try_parse_number(label))
 
-    tokens = normalize_text(snippet).split()
-    if contains_progress_keyword(tokens):
-        digits = re.search(r"(\d+(?:\.\d+)?)", snippet)
-        if digits:
-            label = digits.group(1)
-            return (label, try_parse_number(label))
-    return (None, None)
 
-
-def try_parse_number(value: str) -> Optional[float]:
-    try:
-        return float(value)
-    except ValueError:
-        return None
+URL_SCHEME_CHARS = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789+-.")
 
 
+@lru_cache(maxsize=1024)
 def normalize_host(value: str) -> str:
-    try:
-        host = urlparse(value).hostname or value
-    except ValueError:
-        host = value
+    # equivalent to urlparse(value).hostname for the URLs we store, without urllib's overhead
+    host = value
+    rest = value
+    colon = value.find(":")
+    if colon > 0 and value[0].isalpha() and URL_SCHEME_CHARS.issuperset(value[:colon]):
+        rest = value[colon + 1 :]
+    if rest.startswith("//"):
+        netloc = rest[2:]
+        for delimiter in "/?#":
+            end = netloc.find(delimiter)
+            if end != -1:
+                netloc = netloc[:end]
+        if ("[" in netloc) != ("]" in netloc):
+            # urlparse rejects unbalanced IPv6 brackets; fall back to the raw value as before
+            netloc = ""
+        hostinfo = netloc.rpartition("@")[2]
+        _, bracket, bracketed = hostinfo.partition("[")
+        hostname = bracketed.partition("]")[0] if bracket else hostinfo.partition(":")[0]
+        host = hostname or value
     host = host.lower()
     return host[4:] if host.startswith("www.") else host
 
 
+# mounted last so every API route above is matched before the static catch-all
+app.mount(
+    "/",
+    SPAStaticFiles(directory=FRONTEND_DIST, html=True, check_dir=False),
+    name="spa",
+)
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
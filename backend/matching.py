@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+# String kernels for the /api/matches hot path. Kept free of FastAPI/pydantic so the
+# module can be compiled with mypyc (see Dockerfile); it also runs as plain Python.
+
+from functools import lru_cache
+import re
+from typing import FrozenSet, List, Optional, Tuple
+
+# chapter|chap|ch.|ch|c factored into a prefix trie, so each position costs one branch
+# instead of five alternatives; matches are identical
+CHAPTER_REGEX = re.compile(r"c(?:h(?:ap(?:ter)?|\.)?)?\s*(\d+(?:\.\d+)?)", re.IGNORECASE)
+DIGIT_REGEX = re.compile(r"(\d+(?:\.\d+)?)")
+# whitespace counts as non-alphanumeric, so one pass drops punctuation and collapses runs
+NON_ALNUM_REGEX = re.compile(r"[^a-z0-9]+")
+PROGRESS_KEYWORDS = frozenset({"chapter", "chap", "ch", "vol", "volume", "episode", "ep", "season"})
+PROGRESS_PREFIXES = tuple(sorted(PROGRESS_KEYWORDS, key=len, reverse=True))
+# matches a token that is_progress_token would accept, straight off the casefolded text
+PROGRESS_KEYWORD_REGEX = re.compile(
+    r"(?<![a-z0-9])(?:" + "|".join(PROGRESS_PREFIXES) + r")[0-9]*(?![a-z0-9])"
+)
+
+
+@lru_cache(maxsize=16384)
+def normalize_text(value: str) -> str:
+    return NON_ALNUM_REGEX.sub(" ", value.casefold()).strip()
+
+
+# only ever sees series titles, aliases and the mock catalogue, so nearly every call is a hit;
+# kept separate from normalize_text's cache, which scraped snippets churn through
+@lru_cache(maxsize=4096)
+def canonicalize_title(value: str) -> str:
+    return NON_ALNUM_REGEX.sub("", value.casefold())
+
+
+def is_progress_token(token: str) -> bool:
+    if token in PROGRESS_KEYWORDS:
+        return True
+    # otherwise only glued forms like "ch12" / "vol3" count; they must end in a digit
+    if not token[-1:].isdigit():
+        return False
+    for prefix in PROGRESS_PREFIXES:
+        if token.startswith(prefix) and token != prefix:
+            suffix = token[len(prefix) :]
+            if suffix.isdigit():
+                return True
+    return False
+
+
+def last_progress_index(tokens: List[str]) -> int:
+    # tokens[k:] holds a progress keyword exactly when k <= this index, so one int per
+    # candidate answers the remainder check for any title length
+    for index in range(len(tokens) - 1, -1, -1):
+        if is_progress_token(tokens[index]):
+            return index
+    return -1
+
+
+def is_structural_match(
+    normalized_title: str,
+    title_tokens: List[str],
+    title_set: FrozenSet[str],
+    candidate_norm: str,
+    candidate_tokens: List[str],
+    candidate_token_set: FrozenSet[str],
+    candidate_last_progress: int,
+    ratio: float,
+) -> bool:
+    # ratio is Indel.normalized_similarity(normalized_title, candidate_norm), which the caller
+    # already has from its batch pass
+    if not candidate_norm:
+        return False
+    if ratio >= 0.9:
+        return True
+
+    # float/int compares go first so the subset test and prefix slice only run when they can
+    # still decide the result
+    title_length = len(title_tokens)
+    if title_length >= 2:
+        if ratio >= 0.75 and title_set.issubset(candidate_token_set):
+            return True
+        # both norms are single-space joined tokens, so a token prefix is a string prefix that
+        # ends at a space; checked in place instead of slicing the token list
+        return (
+            candidate_last_progress >= title_length
+            and candidate_norm.startswith(normalized_title)
+            and candidate_norm.startswith(" ", len(normalized_title))
+        )
+
+    if title_length == 1:
+        title_token = title_tokens[0]
+        if candidate_norm == title_token:
+            return True
+        if candidate_last_progress >= 1 and candidate_tokens[0] == title_token:
+            return True
+    return False
+
+
+def extract_chapter_details(
+    primary: Optional[str], secondary: Optional[str] = None
+) -> Tuple[Optional[str], Optional[float]]:
+    for snippet in (primary, secondary):
+        if not snippet:
+            continue
+        label, number = detect_chapter_in_snippet(snippet)
+        if label:
+            return (label, number)
+    return (None, None)
+
+
+def detect_chapter_in_snippet(snippet: str) -> Tuple[Optional[str], Optional[float]]:
+    # both paths need a number, and most snippets (titles, menu text) have none
+    digits = DIGIT_REGEX.search(snippet)
+    if digits is None:
+        return (None, None)
+
+    match = CHAPTER_REGEX.search(snippet)
+    if match:
+        label = match.group(1).strip()
+        return (label, try_parse_number(label))
+
+    if PROGRESS_KEYWORD_REGEX.search(snippet.casefold()):
+        label = digits.group(1)
+        return (label, try_parse_number(label))
+    return (None, None)
+
+
+def try_parse_number(value: str) -> Optional[float]:
+    try:
+        return float(value)
+    except ValueError:
+        return None
@@ -0,0 +1,85 @@
+import orjson
+import pytest
+from fastapi import HTTPException
+
+import main
+
+
+@pytest.fixture
+def make_store(tmp_path, monkeypatch):
+    def build(websites=(), series=()):
+        websites_file = tmp_path / "websites.json"
+        series_file = tmp_path / "series.json"
+        websites_file.write_bytes(orjson.dumps(list(websites)))
+        series_file.write_bytes(orjson.dumps(list(series)))
+        monkeypatch.setattr(main, "WEBSITES_FILE", websites_file)
+        monkeypatch.setattr(main, "SERIES_FILE", series_file)
+        return main.InMemoryStore()
+
+    return build
+
+
+def test_removing_series_keeps_shared_token_indexed(make_store):
+    store = make_store(
+        series=[
+            {"id": "a", "title": "One Piece", "aliases": ["OP"]},
+            {"id": "b", "title": "Onepiece Party", "aliases": ["op"]},
+        ]
+    )
+    assert store.series_by_token["op"] == "a"
+
+    store.remove_series("a")
+
+    assert store.series_by_token["op"] == "b"
+    assert "onepiece" not in store.series_by_token
+    with pytest.raises(HTTPException) as excinfo:
+        store.add_series(main.SeriesCreate(title="OP"))
+    assert excinfo.value.status_code == 409
+
+
+def test_updating_series_hands_shared_token_to_other_owner(make_store):
+    store = make_store(
+        series=[
+            {"id": "a", "title": "Blue Lock", "aliases": ["BL"]},
+            {"id": "b", "title": "Blue Period", "aliases": ["bl"]},
+        ]
+    )
+    assert store.series_by_token["bl"] == "a"
+
+    store.update_series("a", main.SeriesUpdate(aliases=[]))
+
+    assert store.series_by_token["bl"] == "b"
+    assert store.series_by_token["bluelock"] == "a"
+
+
+def test_removing_site_keeps_shared_host_indexed(make_store):
+    store = make_store(
+        websites=[
+            {"id": "a", "label": "A", "url": "https://example.com/list"},
+            {"id": "b", "label": "B", "url": "https://www.example.com/other"},
+        ]
+    )
+    assert store.websites_by_host["example.com"] == "a"
+
+    store.remove_site("a")
+
+    assert store.websites_by_host["example.com"] == "b"
+
+
+def test_snapshot_is_parsed_into_its_own_store(make_store):
+    store = make_store(websites=[{"id": "a", "label": "A", "url": "https://example.com/list"}])
+
+    store.record_site_snapshot("a", "<ul><li><a href='/op'>One Piece Chapter 1100</a></li></ul>")
+
+    assert "a" in store.candidates_cache
+    assert "a" not in main.store.candidates_cache
+    candidates = store.candidates_cache["a"][1]
+    assert "One Piece Chapter 1100" in candidates.texts
+
+
+def test_canonical_map_uses_its_own_store_tokens(make_store):
+    store = make_store(series=[{"id": "a", "title": "Blue Lock", "aliases": ["BL"]}])
+
+    assert store.canonical_map == {"bluelock": "Blue Lock", "bl": "Blue Lock"}
+    assert "a" in store._series_tokens
+    assert "a" not in main.store._series_tokens